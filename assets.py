@@ -0,0 +1,91 @@
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+# Asset locations and loading.
+# Paths resolve relative to this file (fonts/, background.png, ...), so the game runs
+# from any working directory. System font lookups are cached in .cache/fonts.json:
+# pygame.font.SysFont enumerates every installed font on its first call, which on a warm
+# start is skipped entirely and the font file is opened directly. Heavy assets can be
+# handed to an AssetLoader, which loads them on a worker thread while the start screen
+# is already showing.
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ASSET_DIR, ".cache")
+FONT_CACHE_PATH = os.path.join(CACHE_DIR, "fonts.json")
+
+_font_paths = None  # System font name -> file path (None: not installed, pygame's default font is used)
+
+
+def asset_path(*parts):
+    return os.path.join(ASSET_DIR, *parts)
+
+
+def write_atomic(path, write, mode="wb"):
+    # Cache writes: write(f) goes to a temp file next to `path` which then replaces it in one
+    # step, so readers never see half a file. The temp name is unique per call, so concurrent
+    # runs (bench children, a running game) can't clobber each other's temp file.
+    # Returns False if it couldn't be written (e.g. a read-only install).
+    tmp_path = None
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(mode, dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                         delete=False) as f:
+            tmp_path = f.name
+            write(f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return False
+    return True
+
+
+def _cached_font_paths():
+    global _font_paths
+    if _font_paths is None:
+        _font_paths = {}
+        try:
+            with open(FONT_CACHE_PATH) as f:
+                cached = json.load(f)
+            if cached.get("platform") == sys.platform:
+                _font_paths = cached["fonts"]
+        except (OSError, ValueError, KeyError):
+            pass
+    return _font_paths
+
+
+def find_font(name):
+    # Same lookup as pygame.font.SysFont, remembered across runs (delete .cache/fonts.json after installing fonts)
+    paths = _cached_font_paths()
+    if name in paths and (paths[name] is None or os.path.exists(paths[name])):
+        return paths[name]
+    paths[name] = pygame.font.match_font(name)
+    # Read-only install: look it up again next run
+    write_atomic(FONT_CACHE_PATH, lambda f: json.dump({"platform": sys.platform, "fonts": paths}, f, indent=1), "w")
+    return paths[name]
+
+
+class AssetLoader:
+    # Runs loaders on one worker thread; get() waits for an asset that isn't ready yet.
+    # Loaders shouldn't touch the display (no convert()), that stays on the main thread.
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+        self.futures = {}  # asset name -> Future
+
+    def load(self, name, loader, *args):
+        self.futures[name] = self.executor.submit(loader, *args)
+
+    def ready(self, name):
+        return self.futures[name].done()
+
+    def get(self, name):
+        return self.futures[name].result()  # Re-raises anything the loader raised
@@ -0,0 +1,139 @@
+import hashlib
+import os
+
+import numpy as np
+import pygame
+
+from assets import CACHE_DIR as ASSET_CACHE_DIR, write_atomic
+
+# Sound effects and soundtrack.
+# Effects are synthesized with NumPy into int16 PCM buffers. Each buffer is cached on
+# disk as a .npy file keyed by its generator and parameters, memory-mapped back in on
+# later runs, and only built the first time the sound is actually played.
+# The soundtrack is streamed with pygame.mixer.music instead of decoded into RAM, and
+# only opened when it first starts playing.
+
+CACHE_DIR = os.path.join(ASSET_CACHE_DIR, "audio")
+
+# Bump when a generator's output changes so stale cache files are ignored
+CACHE_VERSION = 1
+
+
+def generate_chirp(sample_rate=44100, duration=0.15, freq_start=600, freq_end=300, decay=8):
+    # Decaying frequency sweep: shoot, die and bonus-life sounds
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    freq = np.linspace(freq_start, freq_end, len(t))
+    audio = 32767 * np.sin(2 * np.pi * freq * t) * np.exp(-t * decay)
+    return audio.astype(np.int16)
+
+
+def generate_hit_sound(sample_rate=44100, duration=0.15, seed=0):
+    samples = int(sample_rate * duration)
+    noise = np.random.default_rng(seed).integers(-32768, 32767, samples)
+    audio = noise * np.exp(-np.linspace(0, 5, samples))
+    return audio.astype(np.int16)
+
+
+def generate_modem_music(sample_rate=44100, duration=2.0, seed=0):
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    audio = np.zeros(len(t))
+    for freq_start, freq_end in [(300, 700), (900, 500), (600, 800)]:
+        freq = np.linspace(freq_start, freq_end, len(t))
+        audio += 5000 * np.sin(2 * np.pi * freq * t)
+    audio += np.random.default_rng(seed).integers(-2000, 2000, len(t))
+    audio = np.clip(audio, -32768, 32767)
+    return audio.astype(np.int16)
+
+
+def generate_drum_beat(sample_rate=44100, duration=4.0, beat_interval=0.5):
+    # 4-second loop for a mellow 120 BPM beat (2 beats per second)
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    audio = np.zeros((len(t), 2))  # Stereo
+    for i in range(int(duration / beat_interval)):
+        time = i * beat_interval
+        start = int(time * sample_rate)
+        end = int((time + 0.2) * sample_rate)
+        if end <= len(t):
+            freq = 100  # Bass drum
+            audio[start:end, 0] += 15000 * np.sin(2 * np.pi * freq * t[start:end]) * np.exp(-t[start:end] * 5)
+            audio[start:end, 1] += 15000 * np.sin(2 * np.pi * freq * t[start:end]) * np.exp(-t[start:end] * 5)
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+# name -> (generator, parameters); the parameters are part of the cache key
+SOUNDS = {
+    "shoot": (generate_chirp, {"duration": 0.15, "freq_start": 600, "freq_end": 300, "decay": 8}),
+    "hit": (generate_hit_sound, {"duration": 0.15, "seed": 0}),
+    "modem": (generate_modem_music, {"duration": 2.0, "seed": 0}),
+    "drum": (generate_drum_beat, {"duration": 4.0, "beat_interval": 0.5}),
+    "die": (generate_chirp, {"duration": 0.3, "freq_start": 200, "freq_end": 50, "decay": 4}),
+    "bonus": (generate_chirp, {"duration": 0.2, "freq_start": 800, "freq_end": 1000, "decay": 3}),
+}
+
+
+class AudioBank:
+    def __init__(self, sounds=SOUNDS, cache_dir=CACHE_DIR):
+        self.specs = sounds
+        self.cache_dir = cache_dir
+        self.sounds = {}  # name -> pygame.mixer.Sound, built on first use
+
+    def cache_path(self, name):
+        generator, params = self.specs[name]
+        key = f"{CACHE_VERSION}:{generator.__name__}:{sorted(params.items())!r}"
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{name}_{digest}.npy")
+
+    def pcm(self, name):
+        path = self.cache_path(name)
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            pass
+        generator, params = self.specs[name]
+        audio = generator(**params)
+        write_atomic(path, lambda f: np.save(f, audio))  # Read-only install: synthesize again next run
+        return audio
+
+    def sound(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            sound = self.sounds[name] = pygame.mixer.Sound(buffer=np.ascontiguousarray(self.pcm(name)))
+        return sound
+
+    def play(self, name, loops=0):
+        return self.sound(name).play(loops)
+
+
+class Soundtrack:
+    # Background music streamed from disk, falling back to a looped sound from the bank
+    def __init__(self, path, bank, fallback="drum"):
+        self.path = path
+        self.bank = bank
+        self.fallback = fallback
+        self.loaded = False
+        self.use_fallback = False
+
+    def load(self):
+        try:
+            pygame.mixer.music.load(self.path)
+        except pygame.error:
+            print(f"Error: {self.path} not found. Using drum beat instead.")
+            self.use_fallback = True  # Fallback to drum beat if soundtrack fails
+        self.loaded = True
+
+    def play(self):
+        if not self.loaded:
+            self.load()
+        if self.use_fallback:
+            self.bank.play(self.fallback, -1)
+        else:
+            pygame.mixer.music.play(-1)  # Play soundtrack on loop
+
+    def stop(self):
+        pygame.mixer.music.stop()
+
+    def pause(self):
+        pygame.mixer.music.pause()
+
+    def unpause(self):
+        pygame.mixer.music.unpause()
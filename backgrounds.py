@@ -0,0 +1,88 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pygame
+
+from assets import CACHE_DIR, write_atomic
+
+# Dimmed background variants, computed in bulk with surfarray and cached on disk.
+# Cache files are keyed by the source image hash, the dim factor and the resolution,
+# so a warm start loads the finished pixels without decoding or scaling the PNG.
+# preload() does the file work (hashing, decoding, dimming) and can run on an
+# AssetLoader thread; turning pixels into display surfaces stays on the main thread.
+
+
+def dim_pixels(pixels, factor):
+    # Same result as int(channel * factor) per pixel, done for the whole image at once
+    return (pixels * factor).astype(np.uint8)
+
+
+class BackgroundCache:
+    def __init__(self, path, size, cache_dir=CACHE_DIR):
+        self.path = path
+        self.size = tuple(size)
+        self.cache_dir = cache_dir
+        self.variants = {}  # dim factor -> Surface
+        self.loaded = {}  # dim factor -> pixels preloaded but not yet made into a Surface
+        self.lock = threading.Lock()  # preload() may be running on a loader thread
+        self._pixels = None  # Scaled source pixels, only loaded on a cache miss
+        self._source_hash = None
+
+    @property
+    def source_hash(self):
+        if self._source_hash is None:
+            with open(self.path, "rb") as f:
+                self._source_hash = hashlib.sha1(f.read()).hexdigest()[:16]
+        return self._source_hash
+
+    def _cache_path(self, factor):
+        width, height = self.size
+        return os.path.join(self.cache_dir, f"bg_{self.source_hash}_{factor:g}_{width}x{height}.npy")
+
+    def source_pixels(self):
+        if self._pixels is None:
+            image = pygame.image.load(self.path)
+            image = pygame.transform.scale(image, self.size)
+            self._pixels = pygame.surfarray.array3d(image)
+        return self._pixels
+
+    def _to_surface(self, pixels):
+        surface = pygame.surfarray.make_surface(pixels)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def preload(self, factors):
+        for factor in factors:
+            with self.lock:
+                if factor not in self.variants and factor not in self.loaded:
+                    self.loaded[factor] = self.dimmed_pixels(factor)
+
+    def dimmed(self, factor):
+        # Each level is built on first use, so registering extra levels costs nothing at startup
+        surface = self.variants.get(factor)
+        if surface is not None:
+            return surface
+        with self.lock:  # Waits for a preload() that's busy with this level
+            pixels = self.loaded.pop(factor, None)
+            if pixels is None:
+                pixels = self.dimmed_pixels(factor)
+        surface = self._to_surface(pixels)
+        self.variants[factor] = surface
+        return surface
+
+    def dimmed_pixels(self, factor):
+        cache_path = self._cache_path(factor)
+        pixels = None
+        try:
+            pixels = np.load(cache_path)
+            if pixels.shape != (self.size[0], self.size[1], 3):
+                pixels = None
+        except (OSError, ValueError):
+            pixels = None
+        if pixels is None:
+            pixels = dim_pixels(self.source_pixels(), factor)
+            write_atomic(cache_path, lambda f: np.save(f, pixels))  # Read-only install: just recompute next time
+        return pixels
@@ -0,0 +1,313 @@
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from collision import swept_aabb
+from simulation import (
+    Inputs, WIDTH, HEIGHT, TICK_RATE, PLAYER_WIDTH, PLAYER_Y, PLAYER_SPEED, BULLET_WIDTH, BULLET_HEIGHT,
+    BULLET_SPEED, PAPER_WIDTH, LINE_SPACING, PAPER_SPEED, COLUMNS, COLUMN_WIDTH, MIN_STACK_SIZE, MAX_STACK_SIZE,
+    SPAWN_INTERVAL, START_LIVES, MAX_LIVES, BONUS_LIFE_ODDS,
+)
+
+# Batched simulator for difficulty tuning.
+# Many independent games advance in lockstep, one row per game: bullets and papers are
+# (games, slots) arrays with an alive mask, so a tick costs a handful of NumPy operations
+# however many games are in the batch. Rules follow simulation.step() (same movement,
+# swept collisions, earliest-hit-first resolution, one lost life per tick), minus the
+# purely cosmetic explosions and sound events; games use their own NumPy RNG, so runs
+# are statistically but not bit-for-bit equivalent to step().
+# Batches are spread over a multiprocessing pool and each parameter set gets aggregate
+# survival-time and score distributions.
+#
+#   python batchsim.py --paper-speed 1 1.5 2 --spawn-interval 30 45 60 --games 2000
+#   python batchsim.py --max-lives 3 5 --bonus-odds 0.25 0.5 --policy random --out sweep.json
+
+# The tunables swept over; defaults are the game's own settings
+Params = namedtuple("Params", ["paper_speed", "spawn_interval", "bullet_speed", "max_lives", "bonus_odds"])
+DEFAULT_PARAMS = Params(PAPER_SPEED, SPAWN_INTERVAL, BULLET_SPEED, MAX_LIVES, BONUS_LIFE_ODDS)
+
+MAX_TICKS = 10 * 60 * TICK_RATE  # Games still going after ten minutes are cut off (counted as censored)
+PERCENTILES = [10, 25, 50, 75, 90]
+TRACKER_FIRE_EVERY = 4  # Ticks between the tracker bot's shots
+
+
+class Batch:
+    def __init__(self, games, params, seed=None):
+        self.params = params
+        self.rng = np.random.default_rng(seed)
+        self.tick = 0
+        self.spawn_timer = 0  # Lockstep: every game spawns on the same ticks
+        self.ids = np.arange(games)  # Original game index of each row (rows are dropped as games end)
+        self.player_x = np.full(games, WIDTH // 2 - PLAYER_WIDTH // 2, dtype=np.float64)
+        self.score = np.zeros(games, dtype=np.int64)
+        self.lives = np.full(games, min(START_LIVES, params.max_lives), dtype=np.int64)
+        # Slots for everything that can be alive at once; add() grows them if a bot outfires the estimate
+        bullet_slots = int(np.ceil((PLAYER_Y + BULLET_HEIGHT) / params.bullet_speed)) + 1
+        paper_life = (HEIGHT + MAX_STACK_SIZE * LINE_SPACING) / params.paper_speed
+        paper_slots = int(np.ceil(paper_life / params.spawn_interval)) + 1
+        self.bullets = {
+            "x": np.zeros((games, bullet_slots)),
+            "y": np.zeros((games, bullet_slots)),
+            "alive": np.zeros((games, bullet_slots), dtype=bool),
+        }
+        self.papers = {
+            "x": np.zeros((games, paper_slots)),
+            "y": np.zeros((games, paper_slots)),
+            "height": np.zeros((games, paper_slots)),
+            "bonus": np.zeros((games, paper_slots), dtype=bool),
+            "alive": np.zeros((games, paper_slots), dtype=bool),
+        }
+        # Per original game index, filled in as games end
+        self.survival = np.zeros(games, dtype=np.int64)
+        self.final_score = np.zeros(games, dtype=np.int64)
+        self.censored = np.zeros(games, dtype=bool)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def add(columns, rows, **values):
+        # One new entity in the first free slot of each of `rows`
+        alive = columns["alive"]
+        free = ~alive[rows]
+        if not free.any(axis=1).all():
+            for name, column in columns.items():
+                columns[name] = np.concatenate((column, np.zeros_like(column)), axis=1)
+            alive = columns["alive"]
+            free = ~alive[rows]
+        slot = free.argmax(axis=1)
+        for name, value in values.items():
+            columns[name][rows, slot] = value
+        alive[rows, slot] = True
+
+    def keep(self, rows):
+        # Drop every other row (finished games)
+        self.ids = self.ids[rows]
+        self.player_x = self.player_x[rows]
+        self.score = self.score[rows]
+        self.lives = self.lives[rows]
+        for columns in (self.bullets, self.papers):
+            for name in columns:
+                columns[name] = columns[name][rows]
+
+    def step(self, inputs):
+        # inputs: Inputs of per-row arrays (left, right bools and fire counts)
+        params = self.params
+        rng = self.rng
+        games = len(self)
+        self.tick += 1
+
+        fire = np.asarray(inputs.fire)
+        for shot in range(int(fire.max(initial=0))):
+            rows = np.flatnonzero(fire > shot)
+            self.add(self.bullets, rows, x=self.player_x[rows] + PLAYER_WIDTH // 2 - BULLET_WIDTH // 2, y=PLAYER_Y)
+
+        x = self.player_x
+        x[:] = np.where(inputs.left & (x > 0), x - PLAYER_SPEED, x)
+        x[:] = np.where(inputs.right & (x < WIDTH - PLAYER_WIDTH), x + PLAYER_SPEED, x)
+
+        self.spawn_timer += 1
+        if self.spawn_timer >= params.spawn_interval:
+            column = rng.integers(0, COLUMNS, games)
+            height = rng.integers(MIN_STACK_SIZE, MAX_STACK_SIZE + 1, games) * LINE_SPACING
+            self.add(self.papers, np.arange(games), x=column * COLUMN_WIDTH + (COLUMN_WIDTH - PAPER_WIDTH) // 2,
+                     y=-height, height=height, bonus=rng.random(games) < 0.5)
+            self.spawn_timer = 0
+
+        bullets = self.bullets
+        bullets["y"] -= params.bullet_speed
+        papers = self.papers
+        papers["y"] += params.paper_speed
+
+        # Broadphase: each live bullet against the live stacks of its own game that it overlaps
+        # horizontally (stacks never change x), then the swept test on just those pairs
+        game, bullet = np.nonzero(bullets["alive"])
+        bullet_x = bullets["x"][game, bullet]
+        paper_x = papers["x"][game]
+        near = papers["alive"][game] & (bullet_x[:, None] < paper_x + PAPER_WIDTH) & (bullet_x[:, None] + BULLET_WIDTH > paper_x)
+        pair, paper = np.nonzero(near)
+        game, bullet = game[pair], bullet[pair]
+        hit, toi = swept_aabb(
+            bullet_x[pair], bullets["y"][game, bullet], BULLET_WIDTH, BULLET_HEIGHT, -params.bullet_speed,
+            paper_x[pair, paper], papers["y"][game, paper], PAPER_WIDTH, papers["height"][game, paper],
+            params.paper_speed,
+        )
+        game, bullet, paper, toi = game[hit], bullet[hit], paper[hit], toi[hit]
+        if len(game):
+            # Earliest contact first, each bullet and paper used once; flat argmin breaks ties by
+            # bullet then paper index like find_hits()
+            rows, local = np.unique(game, return_inverse=True)
+            paper_slots = papers["alive"].shape[1]
+            toi_table = np.full((len(rows), bullets["alive"].shape[1], paper_slots), np.inf)
+            toi_table[local, bullet, paper] = toi
+            toi = toi_table
+            while len(rows):
+                flat = toi.reshape(len(rows), -1)
+                best = flat.argmin(axis=1)
+                found = flat[np.arange(len(rows)), best] < np.inf
+                rows, toi, best = rows[found], toi[found], best[found]
+                if not len(rows):
+                    break
+                b, p = np.divmod(best, paper_slots)
+                local = np.arange(len(rows))
+                toi[local, b, :] = np.inf
+                toi[local, :, p] = np.inf
+                bullets["alive"][rows, b] = False
+                papers["alive"][rows, p] = False
+                self.score[rows] += 1
+                # check_extra_life()
+                lucky = ((self.score[rows] % 100 == 0) & papers["bonus"][rows, p]
+                         & (rng.random(len(rows)) < params.bonus_odds) & (self.lives[rows] < params.max_lives))
+                self.lives[rows[lucky]] += 1
+        # Bullets leaving the screen go only after their last sweep, like step()
+        bullets["alive"] &= bullets["y"] > -BULLET_HEIGHT
+
+        # Only one paper reaching the bottom costs a life per tick
+        fallen = papers["alive"] & (papers["y"] + papers["height"] > HEIGHT)
+        rows = np.flatnonzero(fallen.any(axis=1))
+        if len(rows):
+            papers["alive"][rows, fallen[rows].argmax(axis=1)] = False
+            self.lives[rows] -= 1
+            over = self.lives <= 0
+            if over.any():
+                self.finish(over)
+                self.keep(~over)
+
+    def finish(self, rows, censored=False):
+        ids = self.ids[rows]
+        self.survival[ids] = self.tick
+        self.final_score[ids] = self.score[rows]
+        self.censored[ids] = censored
+
+    def run(self, policy, max_ticks=MAX_TICKS):
+        while len(self) and self.tick < max_ticks:
+            self.step(policy(self))
+        self.finish(np.arange(len(self)), censored=True)
+        return self.survival, self.final_score, self.censored
+
+
+def random_policy(batch):
+    # Same odds as the benchmark's soak bot
+    rng = batch.rng
+    games = len(batch)
+    return Inputs(rng.random(games) < 0.3, rng.random(games) < 0.3, (rng.random(games) < 0.2).astype(np.int64))
+
+
+def tracker_policy(batch):
+    # Chase the stack closest to the bottom and shoot while under it
+    papers = batch.papers
+    bottom = np.where(papers["alive"], papers["y"] + papers["height"], -np.inf)
+    target = bottom.argmax(axis=1)
+    rows = np.arange(len(batch))
+    has_target = papers["alive"][rows, target]
+    offset = papers["x"][rows, target] + PAPER_WIDTH / 2 - (batch.player_x + PLAYER_WIDTH / 2)
+    left = has_target & (offset < -PLAYER_SPEED / 2)
+    right = has_target & (offset > PLAYER_SPEED / 2)
+    fire = has_target & (np.abs(offset) < PAPER_WIDTH / 2) & (batch.tick % TRACKER_FIRE_EVERY == 0)
+    return Inputs(left, right, fire.astype(np.int64))
+
+
+POLICIES = {"random": random_policy, "tracker": tracker_policy}
+
+
+def run_batch(task):
+    # Pool worker: (parameter set index, Params, games, seed entropy, policy name, max ticks)
+    index, params, games, entropy, policy, max_ticks = task
+    batch = Batch(games, params, np.random.SeedSequence(entropy))
+    return (index,) + batch.run(POLICIES[policy], max_ticks)
+
+
+def percentiles(values):
+    return dict(zip((f"p{p}" for p in PERCENTILES), np.percentile(values, PERCENTILES).tolist()))
+
+
+def summarize(params, survival, score, censored):
+    seconds = survival / TICK_RATE
+    return {
+        "params": params._asdict(),
+        "games": len(survival),
+        "survival_s": dict(mean=float(seconds.mean()), **percentiles(seconds)),
+        "censored": float(censored.mean()),  # Share of games still alive at max_ticks
+        "score": dict(mean=float(score.mean()), max=int(score.max()), **percentiles(score)),
+        "score_histogram": np.bincount(score).tolist(),
+    }
+
+
+def sweep(param_sets, games=1000, batch_size=250, policy="tracker", max_ticks=MAX_TICKS, seed=0, processes=None):
+    # Every parameter set is split into batches of batch_size games; each batch gets its
+    # own seed derived from (seed, parameter set, batch), so results don't depend on scheduling
+    tasks = []
+    for index, params in enumerate(param_sets):
+        for number, start in enumerate(range(0, games, batch_size)):
+            tasks.append((index, params, min(batch_size, games - start), (seed, index, number), policy, max_ticks))
+    results = [([], [], []) for _ in param_sets]
+    with multiprocessing.Pool(processes) as pool:
+        for index, survival, score, censored in pool.imap_unordered(run_batch, tasks):
+            for collected, values in zip(results[index], (survival, score, censored)):
+                collected.append(values)
+    return [summarize(params, *(np.concatenate(values) for values in collected))
+            for params, collected in zip(param_sets, results)]
+
+
+def write_results(summaries, path):
+    # .csv gets one flat row per parameter set; anything else gets the full JSON (with histograms)
+    if path.endswith(".csv"):
+        rows = []
+        for summary in summaries:
+            row = dict(summary["params"], games=summary["games"], censored=summary["censored"])
+            for group in ("survival_s", "score"):
+                row.update((f"{group}_{name}", value) for name, value in summary[group].items())
+            rows.append(row)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, "w") as f:
+            json.dump(summaries, f, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched Paperwork Invaders simulations for difficulty tuning")
+    parser.add_argument("--paper-speed", type=float, nargs="+", default=[DEFAULT_PARAMS.paper_speed])
+    parser.add_argument("--spawn-interval", type=int, nargs="+", default=[DEFAULT_PARAMS.spawn_interval])
+    parser.add_argument("--bullet-speed", type=float, nargs="+", default=[DEFAULT_PARAMS.bullet_speed])
+    parser.add_argument("--max-lives", type=int, nargs="+", default=[DEFAULT_PARAMS.max_lives])
+    parser.add_argument("--bonus-odds", type=float, nargs="+", default=[DEFAULT_PARAMS.bonus_odds])
+    parser.add_argument("--games", type=int, default=1000, help="games per parameter set")
+    parser.add_argument("--batch", type=int, default=250, help="games simulated together in one worker task")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="tracker")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, help="pool size (default: one per CPU)")
+    parser.add_argument("--out", default="sweep.csv", help="where to write the results (.csv or .json)")
+    args = parser.parse_args()
+
+    # Every combination of the given values
+    param_sets = [Params(*values) for values in itertools.product(
+        args.paper_speed, args.spawn_interval, args.bullet_speed, args.max_lives, args.bonus_odds)]
+    start = time.perf_counter()
+    summaries = sweep(param_sets, args.games, args.batch, args.policy, args.max_ticks, args.seed, args.processes)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'paper':>6}{'spawn':>6}{'bullet':>7}{'lives':>6}{'bonus':>6}   {'survival s p10/p50/p90':>24}"
+          f"{'score p10/p50/p90':>20}{'censored':>10}")
+    for summary in summaries:
+        params, survival, score = Params(**summary["params"]), summary["survival_s"], summary["score"]
+        print(f"{params.paper_speed:>6g}{params.spawn_interval:>6}{params.bullet_speed:>7g}{params.max_lives:>6}"
+              f"{params.bonus_odds:>6g}   {survival['p10']:>8.1f}{survival['p50']:>8.1f}{survival['p90']:>8.1f}"
+              f"{score['p10']:>8.0f}{score['p50']:>6.0f}{score['p90']:>6.0f}{summary['censored']:>10.1%}")
+    games = args.games * len(param_sets)
+    print(f"{games} games in {elapsed:.1f}s ({games / elapsed:.0f} games/s)")
+    write_results(summaries, args.out)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
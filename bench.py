@@ -0,0 +1,289 @@
+import os
+
+# Headless: no window and no sound card needed (export the variables to override)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import struct
+import subprocess
+import sys
+import time
+
+import pygame
+
+from assets import ASSET_DIR, asset_path
+from audio import AudioBank
+from backgrounds import BackgroundCache
+from display import Display
+from hud import sys_font
+from profiler import FrameProfiler
+from renderer import Renderer
+from replay import Replay, ReplayPlayer
+from simulation import (
+    GameState, Inputs, NO_INPUT, step, spawn_paper, WIDTH, HEIGHT, PLAYER_Y, BULLET_WIDTH,
+    LINE_SPACING, MAX_STACK_SIZE, EXPLOSION_FRAMES, EXPLOSION_KILL, PAPER_WIDTH,
+)
+
+# Stress benchmark for the full game loop (simulation + rendering + present), uncapped.
+# Each scenario keeps a fixed number of paper stacks, bullets and explosions alive and
+# runs in its own process, so peak RSS is per scenario. Results are written as JSON;
+# `--compare old.json new.json` diffs two runs (e.g. two revisions).
+#
+#   python bench.py                          # all scenarios -> bench.json
+#   python bench.py papers overload --frames 2000 --out after.json
+#   python bench.py --compare before.json after.json
+#   python bench.py --replay session.rpl     # a recorded real session as the workload
+
+
+# papers: stacks at max stack_size, bullets: in flight, explosions: concurrent,
+# bot: random player instead of scripted entities (normal rules, restarts on game over)
+SCENARIOS = {
+    "papers": {"papers": 40, "bullets": 0, "explosions": 0, "frames": 1200},
+    "bullets": {"papers": 0, "bullets": 400, "explosions": 0, "frames": 1200},
+    "explosions": {"papers": 0, "bullets": 0, "explosions": 60, "frames": 1200},
+    "overload": {"papers": 40, "bullets": 400, "explosions": 60, "frames": 1200},  # "Bureaucracy overload"
+    "soak": {"bot": True, "frames": 36000},  # Ten minutes of game time
+}
+WARMUP_FRAMES = 60
+MIN_REPLAY_TICKS = 2
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Not available on Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def add_paper(state, rng, spread):
+    spawn_paper(state)
+    papers = state.papers
+    i = len(papers) - 1
+    papers.stack_size[i] = MAX_STACK_SIZE
+    height = MAX_STACK_SIZE * LINE_SPACING
+    papers.y[i] = rng.uniform(-height, HEIGHT - height - 1) if spread else -height
+
+
+def add_bullet(state, rng, spread):
+    state.bullets.add(x=rng.uniform(0, WIDTH - BULLET_WIDTH), y=rng.uniform(0, PLAYER_Y) if spread else PLAYER_Y)
+
+
+def add_explosion(state, rng):
+    state.explosions.add(x=rng.uniform(0, WIDTH - PAPER_WIDTH), y=rng.uniform(0, HEIGHT), timer=rng.randrange(EXPLOSION_FRAMES),
+                         max_size=PAPER_WIDTH, kind=EXPLOSION_KILL)
+
+
+def top_up(state, config, rng, spread=False):
+    # Replace whatever was shot, fell off or burnt out so the load stays constant
+    while len(state.papers) < config.get("papers", 0):
+        add_paper(state, rng, spread)
+    while len(state.bullets) < config.get("bullets", 0):
+        add_bullet(state, rng, spread)
+    while len(state.explosions) < config.get("explosions", 0):
+        add_explosion(state, rng)
+
+
+def bot_inputs(rng):
+    return Inputs(rng.random() < 0.3, rng.random() < 0.3, int(rng.random() < 0.2))
+
+
+def run_scenario(name, frames=None, seed=0, dirty_rects=False, replay_path=None, render_scale=1.0):
+    warmup = WARMUP_FRAMES
+    if replay_path:
+        player = ReplayPlayer(Replay.load(replay_path))
+        config = {"replay": os.path.basename(replay_path)}
+        ticks = player.replay.ticks
+        if ticks < MIN_REPLAY_TICKS:
+            sys.exit(f"{replay_path}: recording too short to benchmark ({ticks} ticks)")
+        warmup = min(WARMUP_FRAMES, ticks // 4)  # Short recordings get a shorter warmup
+        frames = min(frames or ticks, ticks - warmup)
+    else:
+        config = SCENARIOS[name]
+        frames = frames or config["frames"]
+    pygame.init()
+    display = Display((WIDTH, HEIGHT), render_scale)
+    backgrounds = BackgroundCache(asset_path("background.png"), display.size)
+    profiler = FrameProfiler(enabled=False, capacity=frames)
+
+    def scaled(size):
+        return max(1, round(size * render_scale))
+
+    # Same fonts as game30.py: the bundled Matrix font for stacks and explosions
+    small_font = pygame.font.Font(asset_path("fonts", "MatrixCodeNFI.ttf"), scaled(16))
+    renderer = Renderer(display.surface, sys_font("Menlo", scaled(27)), small_font, sys_font("Menlo", scaled(54)),
+                        backgrounds, dirty_rects=dirty_rects, profiler=profiler, display=display, seed=seed)
+    audio = AudioBank()
+    rng = random.Random(seed)
+
+    def new_state():
+        state = GameState(seed)
+        if not config.get("bot"):
+            state.lives = 10 ** 9  # Scripted load never ends the game
+            top_up(state, config, rng, spread=True)
+        return state
+
+    state = player.state if replay_path else new_state()
+    games = 1
+    start = time.perf_counter()
+    for frame in range(warmup + frames):
+        if replay_path and player.finished:
+            break  # Recording ended (game over) before the frame budget
+        if frame == warmup:
+            profiler.set_enabled(True)
+            start = time.perf_counter()
+        profiler.begin_frame()
+        profile = profiler.scope
+        with profile("scenario"):
+            if replay_path:
+                inputs = player.replay.inputs(state.tick)  # Recorded inputs on the recorded seed
+            elif config.get("bot"):
+                inputs = bot_inputs(rng)
+                if state.game_over:
+                    state = new_state()
+                    renderer.reset()
+                    games += 1
+            else:
+                inputs = NO_INPUT
+                top_up(state, config, rng)
+        with profile("simulate"):
+            step(state, inputs, profiler)
+        with profile("audio"):
+            for event in state.events:
+                audio.play(event)
+        with profile("render"):
+            renderer.draw_game(state)
+        with profile("present"):
+            renderer.present()
+        pygame.event.pump()
+        profiler.end_frame(bullets=len(state.bullets), papers=len(state.papers), explosions=len(state.explosions))
+    profiler.begin_frame()  # Close out the last frame
+    elapsed = time.perf_counter() - start
+
+    summary = profiler.summary()
+    pygame.quit()
+    return {
+        "scenario": name,
+        "config": config,
+        "frames": summary["frames"],
+        "seconds": elapsed,
+        "fps": summary["fps"],
+        "frame_ms": summary["frame_ms"],
+        "phases_ms": summary["phases_ms"],
+        "final_counts": summary["counts"],
+        "games": games,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ASSET_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_isolated(name, args):
+    # Fresh interpreter per scenario so peak RSS isn't inherited from the previous one
+    command = [sys.executable, os.path.abspath(__file__), "--child", name, "--seed", str(args.seed)]
+    if name == "replay":
+        command += ["--replay", args.replay]
+    if args.frames:
+        command += ["--frames", str(args.frames)]
+    if args.dirty_rects:
+        command.append("--dirty-rects")
+    if args.render_scale != 1.0:
+        command += ["--render-scale", str(args.render_scale)]
+    # Only stdout is captured (the result line); the child's stderr passes through so failures show their cause
+    result = subprocess.run(command, stdout=subprocess.PIPE, text=True)
+    if result.returncode:
+        sys.exit(f"{name}: benchmark failed (exit code {result.returncode})")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{'scenario':<12}{'metric':<14}{old.get('revision') or old_path:>14}{new.get('revision') or new_path:>14}{'change':>10}")
+    for name, after in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        rows = [("fps", before["fps"], after["fps"])]
+        rows += [(f"{p} ms", before["frame_ms"][p], after["frame_ms"][p]) for p in ("p50", "p95", "p99")]
+        if before.get("peak_rss_mb") and after.get("peak_rss_mb"):
+            rows.append(("peak RSS MB", before["peak_rss_mb"], after["peak_rss_mb"]))
+        for metric, a, b in rows:
+            change = (b - a) / a * 100 if a else 0.0
+            print(f"{name:<12}{metric:<14}{a:>14.2f}{b:>14.2f}{change:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless stress benchmark for Paperwork Invaders")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--frames", type=int, help="measured frames per scenario (default: per scenario)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dirty-rects", action="store_true", help="benchmark the dirty-rect renderer")
+    parser.add_argument("--render-scale", type=float, default=1.0, help="internal resolution, presented at 800x600")
+    parser.add_argument("--replay", help="also run a recorded session (see replay.py) as the 'replay' scenario")
+    parser.add_argument("--out", default="bench.json", help="where to write the JSON results")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="diff two result files and exit")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args.frames, args.seed, args.dirty_rects, args.replay,
+                                              args.render_scale)))
+        return
+
+    if args.replay:
+        # Checked here rather than only in the child, before any scenario has run
+        try:
+            ticks = Replay.load(args.replay).ticks
+        except (OSError, ValueError, IndexError, struct.error) as error:
+            parser.error(f"can't read replay {args.replay}: {error}")
+        if ticks < MIN_REPLAY_TICKS:
+            parser.error(f"{args.replay}: recording too short to benchmark ({ticks} ticks)")
+
+    names = args.scenarios or ([] if args.replay else list(SCENARIOS))
+    if args.replay:
+        names.append("replay")
+    for name in names:
+        if name not in SCENARIOS and name != "replay":
+            parser.error(f"unknown scenario {name!r}")
+    results = {}
+    for name in names:
+        result = results[name] = run_isolated(name, args)
+        frame = result["frame_ms"]
+        rss = result["peak_rss_mb"]
+        print(f"{name:<12}{result['fps']:8.1f} fps   p50 {frame['p50']:6.2f}  p95 {frame['p95']:6.2f}  "
+              f"p99 {frame['p99']:6.2f} ms" + (f"   peak RSS {rss:.1f} MB" if rss else ""))
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "dirty_rects": args.dirty_rects,
+        "render_scale": args.render_scale,
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=1)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import numpy as np
+
+# Bullet vs. paper stack collision.
+# Papers only ever live in one of COLUMNS fixed lanes, so the broadphase buckets them
+# by lane and each bullet is tested only against stacks in the lane(s) it overlaps.
+# The narrowphase is a swept AABB test over the tick's motion, so a fast bullet can't
+# step over a thin stack between two frames.
+
+
+def swept_aabb(ax, ay, aw, ah, a_dy, bx, by, bw, bh, b_dy):
+    # Boxes A and B are given at their end-of-tick positions after moving a_dy / b_dy
+    # vertically this tick. Arrays broadcast against each other.
+    # Returns (hit, toi): whether they touched during the tick and the time of
+    # first contact in [0, 1].
+    x_overlap = (ax < bx + bw) & (ax + aw > bx)
+    # Track A's top edge relative to B's top edge from the start to the end of the tick
+    rel_end = ay - by
+    rel_dy = a_dy - b_dy
+    rel_start = rel_end - rel_dy
+    low = np.minimum(rel_start, rel_end)
+    high = np.maximum(rel_start, rel_end)
+    hit = x_overlap & (low < bh) & (high > -ah)
+
+    # Time of impact: 0 if already overlapping, else when the leading edge crosses
+    with np.errstate(divide="ignore", invalid="ignore"):
+        toi_up = (rel_start - bh) / -rel_dy  # A moving up relative to B, enters through B's bottom
+        toi_down = (-ah - rel_start) / rel_dy  # A moving down relative to B, enters through B's top
+    toi = np.where(rel_dy < 0, toi_up, toi_down)
+    start_overlap = (rel_start < bh) & (rel_start > -ah)
+    toi = np.where(start_overlap, 0.0, np.clip(toi, 0.0, 1.0))
+    return hit, toi
+
+
+def lane_bounds(x, width, lane_width, lanes):
+    # First and last lane covered by [x, x + width)
+    lo = np.clip((x // lane_width).astype(np.intp), 0, lanes - 1)
+    hi = np.clip(((x + width) // lane_width).astype(np.intp), 0, lanes - 1)
+    return lo, hi
+
+
+def find_hits(bullets, bullet_size, bullet_dy, papers, paper_size, paper_dy, lane_width, lanes):
+    # bullets: (x, y) arrays; papers: (x, y, height, lane) arrays; sizes are (width, height)
+    # with paper height taken per paper. Returns [(bullet_index, paper_index), ...] in the
+    # order the hits happened, each bullet and paper used at most once.
+    bullet_x, bullet_y = bullets
+    paper_x, paper_y, paper_height, paper_lane = papers
+    bullet_width, bullet_height = bullet_size
+    paper_width = paper_size
+    if not len(bullet_x) or not len(paper_x):
+        return []
+
+    # Broadphase: sort papers by lane once, then slice out each lane's stacks
+    order = np.argsort(paper_lane, kind="stable")
+    starts = np.searchsorted(paper_lane[order], np.arange(lanes + 1))
+    bullet_lo, bullet_hi = lane_bounds(bullet_x, bullet_width, lane_width, lanes)
+
+    hit_bullets, hit_papers, hit_times = [], [], []
+    for lane in range(lanes):
+        start, end = starts[lane], starts[lane + 1]
+        if start == end:
+            continue
+        in_lane = np.flatnonzero((bullet_lo <= lane) & (bullet_hi >= lane))
+        if not len(in_lane):
+            continue
+        lane_papers = order[start:end]
+        hit, toi = swept_aabb(
+            bullet_x[in_lane, None], bullet_y[in_lane, None], bullet_width, bullet_height, bullet_dy,
+            paper_x[lane_papers], paper_y[lane_papers], paper_width, paper_height[lane_papers], paper_dy,
+        )
+        b, p = np.nonzero(hit)
+        if len(b):
+            hit_bullets.append(in_lane[b])
+            hit_papers.append(lane_papers[p])
+            hit_times.append(toi[b, p])
+    if not hit_bullets:
+        return []
+
+    # Narrowphase results, earliest contact first (ties broken by index for determinism)
+    hit_bullets = np.concatenate(hit_bullets)
+    hit_papers = np.concatenate(hit_papers)
+    hit_times = np.concatenate(hit_times)
+    ranked = np.lexsort((hit_papers, hit_bullets, hit_times))
+    used_bullets = set()
+    used_papers = set()
+    hits = []
+    for b, p in zip(hit_bullets[ranked].tolist(), hit_papers[ranked].tolist()):
+        if b in used_bullets or p in used_papers:
+            continue
+        used_bullets.add(b)
+        used_papers.add(p)
+        hits.append((b, p))
+    return hits
@@ -0,0 +1,64 @@
+import pygame
+
+from simulation import WIDTH, HEIGHT
+
+# Window and backbuffer.
+# The game is always simulated in WIDTH x HEIGHT coordinates. The renderer draws into
+# `surface` at the internal resolution (render_scale x 800x600, e.g. 0.5 for weak
+# hardware), and present() scales that onto a window of any size, keeping the aspect
+# ratio with black bars. When the internal resolution is the window's own size the
+# renderer draws straight into the window and nothing is scaled.
+
+SCALE_NEAREST = "nearest"  # Integer multiples where they fit, crisp pixels
+SCALE_SMOOTH = "smooth"  # pygame.transform.smoothscale to fill the window
+
+
+def internal_size(render_scale):
+    return max(1, round(WIDTH * render_scale)), max(1, round(HEIGHT * render_scale))
+
+
+class Display:
+    def __init__(self, window_size=None, render_scale=1.0, fullscreen=False, scale_mode=SCALE_NEAREST):
+        if fullscreen:
+            self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)  # Desktop resolution
+        else:
+            self.window = pygame.display.set_mode(window_size or (WIDTH, HEIGHT))
+        self.size = internal_size(render_scale)
+        self.scale_mode = scale_mode
+        if self.size == self.window.get_size():
+            self.surface = self.window  # Direct: no backbuffer
+            self.view = None
+        else:
+            self.surface = pygame.Surface(self.size).convert()
+            self.window.fill((0, 0, 0))  # Letterbox bars stay black
+            self.view = self.window.subsurface(self.fit(self.window.get_size()))  # Where the backbuffer goes
+
+    @property
+    def direct(self):
+        return self.surface is self.window
+
+    def fit(self, window_size):
+        # Rect in the window the backbuffer is scaled into, centred with the aspect ratio kept
+        window_width, window_height = window_size
+        width, height = self.size
+        factor = min(window_width / width, window_height / height)
+        if self.scale_mode == SCALE_NEAREST and factor >= 1:
+            factor = int(factor)
+        rect = pygame.Rect(0, 0, round(width * factor), round(height * factor))
+        rect.center = (window_width // 2, window_height // 2)
+        return rect
+
+    def present(self, dirty=None):
+        # dirty: rects that changed this frame (direct mode only), None for the whole frame
+        if self.direct:
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+            return
+        view = self.view
+        if self.scale_mode == SCALE_SMOOTH and self.surface.get_bitsize() in (24, 32):
+            pygame.transform.smoothscale(self.surface, view.get_size(), view)
+        else:
+            pygame.transform.scale(self.surface, view.get_size(), view)
+        pygame.display.flip()
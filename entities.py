@@ -0,0 +1,85 @@
+import numpy as np
+
+# Struct-of-arrays entity storage.
+# Each field is one preallocated NumPy column; live entities occupy rows [0, count).
+# Columns are exposed as views (store.x, store.y, ...) so movement and culling are
+# single vectorized operations, and deleting one entity is a swap-remove.
+
+
+class EntityStore:
+    def __init__(self, fields, capacity=64):
+        # fields: list of (name, dtype) pairs, one column per field
+        self.fields = [name for name, _ in fields]
+        self.count = 0
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in fields}
+
+    def __len__(self):
+        return self.count
+
+    def __getattr__(self, name):
+        # Only called for names that aren't regular attributes: serve live column views
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name][:self.count]
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        # Augmented assignment (store.y += dy) writes back through here; keep it in the column
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            column = columns[name]
+            view = column[:self.count]
+            if value is not view and not np.shares_memory(value, view):
+                view[...] = value
+            return
+        object.__setattr__(self, name, value)
+
+    def _grow(self):
+        # Double the capacity; amortized this is rare enough to never show up in a frame
+        self.capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+
+    def add(self, **values):
+        if self.count == self.capacity:
+            self._grow()
+        index = self.count
+        for name, value in values.items():
+            self.columns[name][index] = value
+        self.count += 1
+        return index
+
+    def get(self, index):
+        return {name: column[index].item() for name, column in self.columns.items()}
+
+    def remove(self, index):
+        # Swap-remove: move the last live row into the hole
+        last = self.count - 1
+        if index != last:
+            for column in self.columns.values():
+                column[index] = column[last]
+        self.count = last
+
+    def cull(self, dead):
+        # Drop every row where the boolean mask `dead` is set, in one pass per column
+        if not dead.any():
+            return
+        keep = ~dead
+        kept = int(keep.sum())
+        for column in self.columns.values():
+            column[:kept] = column[:self.count][keep]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+    def copy(self):
+        other = EntityStore.__new__(EntityStore)
+        other.fields = list(self.fields)
+        other.count = self.count
+        other.capacity = self.capacity
+        other.columns = {name: column.copy() for name, column in self.columns.items()}
+        return other
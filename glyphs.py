@@ -0,0 +1,44 @@
+import pygame
+
+# Glyph atlas for the Matrix-rain paper stacks.
+# Every Matrix character and every department line is rasterized exactly once
+# into a single sheet; rows are then drawn by blitting sub-rects out of that
+# sheet instead of calling font.render (see matrix.py for the rain rows).
+
+
+class GlyphAtlas:
+    def __init__(self, font, color, chars, lines=()):
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+        self.rects = {}  # text -> Rect inside self.sheet
+
+        # Rasterize every entry once, then pack them left to right into one sheet
+        entries = []
+        for text in list(dict.fromkeys(chars)) + list(dict.fromkeys(lines)):
+            if text not in self.rects:
+                entries.append((text, font.render(text, True, color)))
+                self.rects[text] = None
+        sheet_width = max(1, sum(surface.get_width() for _, surface in entries))
+        self.sheet = pygame.Surface((sheet_width, self.height), pygame.SRCALPHA)
+        x = 0
+        for text, surface in entries:
+            self.sheet.blit(surface, (x, 0))
+            self.rects[text] = pygame.Rect(x, 0, surface.get_width(), self.height)
+            x += surface.get_width()
+        if pygame.display.get_surface() is not None:
+            self.sheet = self.sheet.convert_alpha()
+
+    def blit_row(self, target, row, pos):
+        # Whole lines (department names) are stored as a single entry
+        rect = self.rects.get(row)
+        if rect is not None:
+            target.blit(self.sheet, pos, rect)
+            return
+        x, y = pos
+        for ch in row:
+            rect = self.rects.get(ch)
+            if rect is None:
+                continue  # Character not in the atlas, skip it rather than rasterize mid-frame
+            target.blit(self.sheet, (x, y), rect)
+            x += rect.width
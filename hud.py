@@ -0,0 +1,148 @@
+import functools
+from collections import OrderedDict
+
+import pygame
+
+from assets import find_font
+
+# Retained-mode text layer.
+# Fonts are resolved once, rendered text surfaces are cached by (text, font, color),
+# and labels only re-render when the value they show actually changes.
+
+
+@functools.lru_cache(maxsize=None)
+def sys_font(name, size):
+    # Like pygame.font.SysFont, but the font file lookup is cached across runs (see assets.py)
+    # and each (name, size) is only opened once
+    return pygame.font.Font(find_font(name), size)
+
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()  # (text, font, color) -> Surface, least recently used first
+
+    def render(self, font, text, color):
+        key = (text, font, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)  # Drop the stalest entry (old scores and so on)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+class Label:
+    # A piece of text, optionally on a padded background panel, re-rendered only when its value changes
+    def __init__(self, text_cache, font, color, template="{}", padding=0, background=None, value=None):
+        self.text_cache = text_cache
+        self.font = font
+        self.color = color
+        self.template = template
+        self.padding = padding
+        self.background = background
+        self.value = None
+        self.surface = None
+        self.set(value)
+
+    def set(self, value):
+        if value != self.value or self.surface is None:
+            self.value = value
+            self.surface = None  # Dirty: rebuilt on the next render()
+            return True
+        return False
+
+    def render(self):
+        if self.surface is None:
+            text = self.text_cache.render(self.font, self.template.format(self.value), self.color)
+            if self.background is None and not self.padding:
+                self.surface = text
+            else:
+                padding = self.padding
+                panel = pygame.Surface((text.get_width() + 2 * padding, text.get_height() + 2 * padding))
+                panel.fill(self.background)
+                panel.blit(text, (padding, padding))
+                self.surface = panel
+        return self.surface
+
+
+class Hud:
+    # Score, lives, and Pause indicator on black panels along the top of the screen
+    def __init__(self, font, color, background, screen_width, padding=10, margin=10, text_cache=None):
+        self.text_cache = text_cache or TextCache()
+        self.screen_width = screen_width
+        self.margin = margin
+        self.score = Label(self.text_cache, font, color, "Score: {}", padding, background, 0)
+        self.lives = Label(self.text_cache, font, color, "Lives: {}", padding, background, 0)
+        self.pause = Label(self.text_cache, font, color, "{}", padding, background, "Pause")  # Capitalized "Pause"
+
+    def update(self, score, lives):
+        self.score.set(score)
+        self.lives.set(lives)
+
+    def panels(self):
+        # (surface, topleft) for each panel, in draw order
+        margin = self.margin
+        score = self.score.render()
+        lives = self.lives.render()
+        pause = self.pause.render()
+        return [
+            (score, (margin, margin)),
+            (lives, (self.screen_width - lives.get_width() - margin, margin)),
+            (pause, (self.screen_width // 2 - pause.get_width() // 2, margin)),
+        ]
+
+    def draw(self, screen):
+        # Returns the screen rects covered by the panels
+        return [screen.blit(surface, pos) for surface, pos in self.panels()]
+
+
+class ProfilerOverlay:
+    # FPS, frame-time percentiles, phase costs and entity counts from a FrameProfiler.
+    # The text only changes every `refresh` frames so the overlay itself stays cheap.
+    def __init__(self, font, color, background, pos=(10, 60), refresh=15):
+        self.font = font
+        self.color = color
+        self.background = background
+        self.pos = pos
+        self.refresh = refresh
+        self.visible = False
+        self.surface = None
+        self.built_at = None  # profiler.frames when the surface was last built
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.surface = None
+
+    def lines(self, profiler):
+        summary = profiler.summary()
+        if not summary["frames"]:
+            return ["Profiler: collecting..."]
+        frame = summary["frame_ms"]
+        lines = [
+            f"FPS {summary['fps']:.1f}",
+            f"frame ms p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  p99 {frame['p99']:.2f}",
+        ]
+        lines += [f"{name:<16}{ms:6.2f} ms" for name, ms in summary["phases_ms"].items()]
+        lines += [f"{name:<16}{int(value):6d}" for name, value in summary["counts"].items()]
+        return lines
+
+    def render(self, profiler):
+        if self.surface is None or profiler.frames - self.built_at >= self.refresh:
+            texts = [self.font.render(line, True, self.color) for line in self.lines(profiler)]
+            padding = 6
+            line_height = self.font.get_linesize()
+            width = max(text.get_width() for text in texts) + 2 * padding
+            panel = pygame.Surface((width, line_height * len(texts) + 2 * padding))
+            panel.fill(self.background)
+            for i, text in enumerate(texts):
+                panel.blit(text, (padding, padding + i * line_height))
+            self.surface = panel
+            self.built_at = profiler.frames
+        return self.surface
+
+    def draw(self, screen, profiler):
+        return screen.blit(self.render(profiler), self.pos)
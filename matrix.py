@@ -0,0 +1,59 @@
+import numpy as np
+import pygame
+
+# Matrix rain for the paper stacks.
+# Rows of random characters are generated in bulk with NumPy into a ring of RING_ROWS
+# rows and rasterized once (from the GlyphAtlas) into a sheet, one strip per row. A stack
+# shows a window of consecutive ring rows that slides one row each refresh, so the rain
+# falls through it; nothing is generated per stack. Each refresh regenerates the next
+# block of the ring, so the rain never visibly repeats and the RNG and rasterizing cost
+# is the same however many stacks are on screen.
+
+RING_ROWS = 512
+ROW_CHARS = 8  # Characters per row, as wide as a department line
+REFRESH_ROWS = 32  # Ring rows regenerated per refresh
+
+
+class MatrixRain:
+    def __init__(self, atlas, chars, rows=RING_ROWS, row_chars=ROW_CHARS, refresh_rows=REFRESH_ROWS, rng=None):
+        self.atlas = atlas
+        self.chars = np.array(list(dict.fromkeys(chars)))
+        self.rows = rows
+        self.row_chars = row_chars
+        self.refresh_rows = refresh_rows
+        self.rng = rng or np.random.default_rng()
+        self.row_height = atlas.height
+        self.row_width = row_chars * max(atlas.rects[ch].width for ch in self.chars.tolist())
+        self.sheet = pygame.Surface((max(1, self.row_width), rows * self.row_height), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            self.sheet = self.sheet.convert_alpha()
+        self.cursor = 0  # Next ring row to regenerate
+        self.regenerate(0, rows)
+
+    def regenerate(self, start, count):
+        # One NumPy draw for every character of the block, then rasterize the rows into the sheet
+        picks = self.rng.integers(0, len(self.chars), (count, self.row_chars))
+        rows = np.ascontiguousarray(self.chars[picks]).view(f"<U{self.row_chars}").ravel().tolist()
+        height = self.row_height
+        self.sheet.fill((0, 0, 0, 0), (0, start * height, self.row_width, count * height))
+        for i, row in enumerate(rows):
+            self.atlas.blit_row(self.sheet, row, (0, (start + i) * height))
+
+    def advance(self):
+        # Once per refresh: replace the oldest block of the ring
+        count = min(self.refresh_rows, self.rows - self.cursor)
+        self.regenerate(self.cursor, count)
+        self.cursor = (self.cursor + count) % self.rows
+
+    def draw(self, target, start, count, pos, line_spacing, first_line=0):
+        # `count` consecutive ring rows from `start` (wrapping) as lines first_line, first_line + 1, ...
+        # of a stack at `pos`. line_spacing may be fractional (scaled): each line's offset is rounded
+        # on its own so the stack keeps its exact height. Returns the covered rect.
+        x, y = pos
+        sheet, rows, width, height = self.sheet, self.rows, self.row_width, self.row_height
+        offsets = [round((first_line + i) * line_spacing) for i in range(count)]
+        target.blits([(sheet, (x, y + offset), (0, (start + i) % rows * height, width, height))
+                      for i, offset in enumerate(offsets)], doreturn=False)
+        if not count:
+            return pygame.Rect(x, y, width, 0)
+        return pygame.Rect(x, y + offsets[0], width, offsets[-1] - offsets[0] + height)
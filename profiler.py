@@ -0,0 +1,158 @@
+import csv
+import json
+import time
+
+import numpy as np
+
+# Frame profiler.
+# Named scopes time each phase of a frame; per-frame results go into fixed-size ring
+# buffers (one NumPy array per phase), so memory stays flat however long the game runs.
+# When disabled, scope() hands back a shared no-op context manager and end_frame()
+# returns immediately, so leaving the instrumentation in costs next to nothing.
+# No pygame in here: the headless simulation uses it too.
+
+perf_counter = time.perf_counter
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + (perf_counter() - self.start) * 1000.0
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, capacity=600):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.frames = 0  # Frames recorded in total; ring slot is frames % capacity
+        self.frame_ms = np.zeros(capacity)  # Wall time from one frame start to the next
+        self.phases = {}  # phase name -> ring of ms spent in that phase
+        self.counts = {}  # counter name (entities etc.) -> ring of values
+        self.current = {}  # phase ms accumulated during the frame in progress
+        self.current_counts = {}  # counts reported for the frame in progress
+        self.scopes = {}  # phase name -> reusable _Scope
+        self.frame_start = None
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.frame_start = None  # Don't count the time spent disabled as one long frame
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+        scope = self.scopes.get(name)
+        if scope is None:
+            scope = self.scopes[name] = _Scope(self, name)
+        return scope
+
+    def begin_frame(self):
+        # Called once at the top of every frame; closes out the previous one
+        if not self.enabled:
+            return
+        now = perf_counter()
+        if self.frame_start is not None:
+            self._record((now - self.frame_start) * 1000.0)
+        self.frame_start = now
+        self.current = {}
+
+    def end_frame(self, **counts):
+        # Entity counts etc. for the frame in progress
+        if self.enabled:
+            self.current_counts = counts
+
+    def _record(self, frame_ms):
+        slot = self.frames % self.capacity
+        self.frame_ms[slot] = frame_ms
+        for name, ms in self.current.items():
+            ring = self.phases.get(name)
+            if ring is None:
+                ring = self.phases[name] = np.zeros(self.capacity)
+            ring[slot] = ms
+        for name in self.phases:
+            if name not in self.current:
+                self.phases[name][slot] = 0.0
+        for name, value in self.current_counts.items():
+            ring = self.counts.get(name)
+            if ring is None:
+                ring = self.counts[name] = np.zeros(self.capacity)
+            ring[slot] = value
+        self.frames += 1
+
+    def recorded(self):
+        return min(self.frames, self.capacity)
+
+    def _ordered(self, ring):
+        # Ring contents oldest first
+        n = self.recorded()
+        if self.frames <= self.capacity:
+            return ring[:n]
+        slot = self.frames % self.capacity
+        return np.concatenate((ring[slot:], ring[:slot]))
+
+    def summary(self):
+        n = self.recorded()
+        if not n:
+            return {"frames": 0}
+        frame_ms = self.frame_ms[:n]
+        p50, p95, p99 = np.percentile(frame_ms, [50, 95, 99])
+        mean = float(frame_ms.mean())
+        return {
+            "frames": n,
+            "fps": 1000.0 / mean if mean > 0 else 0.0,
+            "frame_ms": {"mean": mean, "p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(frame_ms.max())},
+            "phases_ms": {name: float(ring[:n].mean()) for name, ring in self.phases.items()},
+            "counts": {name: float(self._ordered(ring)[-1]) for name, ring in self.counts.items()},
+        }
+
+    def rows(self):
+        # One dict per recorded frame, oldest first
+        columns = {"frame_ms": self._ordered(self.frame_ms)}
+        columns.update((name, self._ordered(ring)) for name, ring in self.phases.items())
+        columns.update((name, self._ordered(ring)) for name, ring in self.counts.items())
+        names = list(columns)
+        first = self.frames - self.recorded()
+        return names, [
+            dict({"frame": first + i}, **{name: float(columns[name][i]) for name in names})
+            for i in range(self.recorded())
+        ]
+
+    def dump(self, path):
+        # .csv gets one row per frame; anything else gets a JSON summary plus the frames
+        names, rows = self.rows()
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=["frame"] + names)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, "w") as f:
+                json.dump({"summary": self.summary(), "frames": rows}, f, indent=1)
+
+
+# Shared disabled profiler for code paths that take an optional profiler
+NULL_PROFILER = FrameProfiler(enabled=False, capacity=1)
@@ -0,0 +1,74 @@
+from profiler import perf_counter
+
+# Adaptive quality governor.
+# Gameplay speed is held by the fixed-step loop (see game30.py): a slow frame just runs
+# more simulation steps. What gives way instead is eye candy. The governor watches the
+# smoothed cost of each frame's work (everything except waiting for the next frame) and
+# steps down one quality level when it stays over budget, back up when there has been
+# clear headroom for a while. The gap between the two thresholds stops it flapping.
+# No pygame in here; the renderer reads the current level's settings.
+
+# Cumulative levels, best first:
+#   matrix_refresh: frames between one-row scroll steps of the shared Matrix rain ring
+#   explosion_stride: draw every n-th glyph of each explosion ring
+#   background: composite the background image (False: plain black)
+QUALITY_LEVELS = [
+    {"matrix_refresh": 5, "explosion_stride": 1, "background": True},  # Full quality
+    {"matrix_refresh": 15, "explosion_stride": 1, "background": True},  # Slower Matrix rain
+    {"matrix_refresh": 15, "explosion_stride": 2, "background": True},  # Half the explosion glyphs
+    {"matrix_refresh": 30, "explosion_stride": 3, "background": False},  # No background compositing
+]
+
+
+class QualityGovernor:
+    def __init__(self, budget_ms, levels=QUALITY_LEVELS, enabled=True, smoothing=0.1, headroom=0.6,
+                 degrade_after=30, restore_after=180):
+        self.budget_ms = budget_ms
+        self.levels = levels
+        self.enabled = enabled
+        self.smoothing = smoothing  # Weight of the newest frame in the moving average
+        self.headroom = headroom  # Restore only when the average is under this share of the budget
+        self.degrade_after = degrade_after  # Consecutive frames over budget before dropping a level
+        self.restore_after = restore_after  # Consecutive frames with headroom before going back up
+        self.level = 0
+        self.average_ms = 0.0
+        self.over = 0
+        self.under = 0
+        self.work_start = None
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def begin_frame(self):
+        self.work_start = perf_counter()
+
+    def end_frame(self):
+        # Call before waiting for the next frame; returns True if the level changed
+        if self.work_start is None:
+            return False
+        work_ms = (perf_counter() - self.work_start) * 1000.0
+        self.work_start = None
+        return self.update(work_ms)
+
+    def update(self, work_ms):
+        if not self.enabled:
+            return False
+        self.average_ms += (work_ms - self.average_ms) * self.smoothing
+        if self.average_ms > self.budget_ms:
+            self.over += 1
+            self.under = 0
+        elif self.average_ms < self.budget_ms * self.headroom:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+
+        if self.over >= self.degrade_after and self.level < len(self.levels) - 1:
+            self.level += 1
+        elif self.under >= self.restore_after and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self.over = self.under = 0
+        return True
@@ -0,0 +1,295 @@
+import numpy as np
+import pygame
+
+from glyphs import GlyphAtlas
+from hud import Hud, Label, TextCache, sys_font
+from matrix import MatrixRain
+from particles import ExplosionParticles
+from profiler import NULL_PROFILER
+from quality import QUALITY_LEVELS
+from simulation import (
+    WIDTH, PLAYER_WIDTH, PLAYER_HEIGHT, PLAYER_Y, BULLET_WIDTH, BULLET_HEIGHT, BULLET_SPEED,
+    PAPER_WIDTH, PAPER_SPEED, LINE_SPACING, EXPLOSION_FRAMES, EXPLOSION_KILL, EXPLOSION_PLAYER_HIT, PAPER_WORDS,
+)
+
+# Thin pygame renderer: draws a simulation.GameState, never changes it.
+# Purely visual state (where each stack's Matrix rain starts, the frame clock)
+# lives here, keyed by each paper's paper_id.
+# Frames can fall between simulation ticks, so draw_game() interpolates positions
+# between the previous and the current tick.
+# `screen` may be a reduced- or raised-resolution backbuffer (see display.py): gameplay
+# coordinates are scaled to its size here, and the fonts passed in should be sized to match.
+
+# Colors
+RED = (255, 0, 0)         # Unused now, but kept for reference
+WHITE = (255, 255, 255)   # Unused now, but kept for reference
+YELLOW = (255, 255, 0)    # Unused now, but kept for reference
+BLACK = (0, 0, 0)         # Background for text boxes
+ORANGE = (255, 165, 0)    # Unused now, but kept for reference
+TURQUOISE = (64, 224, 208)  # Unused now, but kept for reference
+GOLD = (255, 215, 0)      # DOGE splash screen
+BROWN = (165, 42, 42)     # Brown explosion for player hit
+MATRIX_GREEN = (0, 200, 0)  # Matrix-inspired green for text
+
+# Dim levels: multiply RGB values by 0.35 for splash, 0.5 for game (pause and game over reuse the game level)
+DIM_SPLASH = 0.35
+DIM_GAME = 0.5
+DIM_PAUSE = DIM_GAME
+DIM_GAME_OVER = DIM_GAME
+
+# Matrix-like characters for the digital rain effect (avoiding squares)
+MATRIX_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*()-+=[]{}|;:,.<>?アィウェオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワヲン"
+
+
+def make_dept_line(word):
+    return f"_{word}_" + "_" * (8 - len(word) - 2)  # e.g., "_FBI____" or "_CIA___" for 8 chars
+
+
+class Renderer:
+    def __init__(self, screen, font, small_font, big_font, backgrounds, dirty_rects=False, full_frame_threshold=0.5,
+                 profiler=NULL_PROFILER, display=None, seed=None):
+        self.screen = screen
+        self.display = display  # Presents the frame; None draws straight into the window
+        self.width, self.height = screen.get_size()
+        self.scale = self.width / WIDTH  # Gameplay coordinates -> pixels
+        self.line_spacing = LINE_SPACING * self.scale  # Unrounded, so stacks keep their gameplay height
+        self.profiler = profiler
+        self.font = font
+        self.small_font = small_font
+        self.big_font = big_font
+        self.backgrounds = backgrounds
+        rng = np.random.default_rng(seed)  # Visual randomness only (seeded for benchmarks)
+        # Rasterize every Matrix character and department line once; stacks are drawn from this atlas
+        self.dept_lines = [make_dept_line(word) for word in PAPER_WORDS]
+        self.paper_atlas = GlyphAtlas(small_font, MATRIX_GREEN, MATRIX_CHARS, self.dept_lines)
+        # Pre-generated ring of Matrix rows that every stack's rain scrolls through
+        self.matrix_rain = MatrixRain(self.paper_atlas, MATRIX_CHARS, rng=rng)
+        # One pre-rendered "=" sprite per explosion kind
+        self.explosion_particles = ExplosionParticles(small_font, {
+            EXPLOSION_KILL: MATRIX_GREEN,  # Matrix green explosion for paper hits
+            EXPLOSION_PLAYER_HIT: BROWN,  # Brown explosion for player hit
+        }, rng=rng)
+
+        # Retained text: fonts resolved once, labels re-rendered only when their value changes
+        self.text_cache = TextCache()
+        # Use smaller font (20, 75% of 27) for score, lives, and pause
+        self.hud = Hud(sys_font("Arial", self.px(20)), MATRIX_GREEN, BLACK, self.width, self.px(10), self.px(10),
+                       text_cache=self.text_cache)
+        self.game_over_label = Label(self.text_cache, font, MATRIX_GREEN, "Game Over! Score: {}", self.px(10), BLACK, 0)
+        self.restart_label = Label(self.text_cache, font, MATRIX_GREEN, "{}", self.px(10), BLACK, "Press R to Restart")
+        self.start_screen = None  # Whole splash screen, composed on first use
+        self.start_screen_background = False  # Composed with the background image (not still loading)
+
+        # Dirty-rect mode: only regions that changed are restored from the background and pushed
+        # to the display; falls back to a full flip when they cover more than the threshold
+        self.dirty_rects = dirty_rects
+        self.full_frame_threshold = full_frame_threshold
+        self.view = None  # Which screen the last frame showed ("start", "game", "paused", "game_over")
+        self.full_frame = True  # Whole screen was redrawn this frame
+        self.rects = []  # Regions drawn this frame
+        self.prev_rects = []  # Regions drawn last frame, to be restored from the background
+        self.set_quality(QUALITY_LEVELS[0])
+        self.reset()
+
+    def px(self, value):
+        # A fixed size or offset in gameplay pixels, at the internal resolution
+        return round(value * self.scale)
+
+    def reset(self):
+        self.frame = 0  # Game frames drawn, the clock for animation
+        self.rain_scroll = 0  # Rows the Matrix rain has fallen
+        self.paper_visuals = {}  # paper_id -> ring row its rain starts from
+
+    def set_quality(self, settings):
+        # One of quality.QUALITY_LEVELS, picked by the QualityGovernor
+        self.matrix_refresh = settings["matrix_refresh"]
+        self.explosion_stride = settings["explosion_stride"]
+        self.background_compositing = settings["background"]
+        self.view = None  # The background may have changed: redraw the whole next frame
+
+    def draw_player(self, player_x):
+        screen = self.screen
+        scale = self.scale
+        player_x *= scale
+        player_y = self.px(PLAYER_Y)
+        # Draw a simple vertical line or small rectangle as the player in Matrix green
+        player_rect = (player_x, player_y, max(1, self.px(PLAYER_WIDTH)), self.px(PLAYER_HEIGHT))
+        self.rects.append(pygame.draw.rect(screen, MATRIX_GREEN, player_rect))  # Simple vertical line or thin rectangle
+
+        # Add "SPACE DOGE" next to the player in Matrix green
+        space_text = self.text_cache.render(self.font, "SPACE", MATRIX_GREEN)  # Text for spacebar
+        doge_text = self.text_cache.render(self.font, "DOGE", MATRIX_GREEN)  # "DOGE" in uppercase
+        # Position "SPACE" and "DOGE" to the right of the player with a small gap
+        space_rect = space_text.get_rect(topleft=(player_x + self.px(PLAYER_WIDTH + 10), player_y))  # 10px gap to right of player
+        doge_rect = doge_text.get_rect(topleft=(space_rect.right + self.px(10), player_y))  # 10px gap after "SPACE"
+        self.rects.append(screen.blit(space_text, space_rect))
+        self.rects.append(screen.blit(doge_text, doge_rect))
+
+    def draw_bullet(self, bullet):
+        scale = self.scale
+        self.rects.append(pygame.draw.rect(self.screen, MATRIX_GREEN, (bullet[0] * scale, bullet[1] * scale, max(1, self.px(BULLET_WIDTH)),
+                                                                       max(1, self.px(BULLET_HEIGHT)))))  # Matrix green bullets
+
+    def draw_paper(self, x, y, stack_size, word, paper_id):
+        rain = self.matrix_rain
+        start = self.paper_visuals.get(paper_id)
+        if start is None:
+            start = self.paper_visuals[paper_id] = int(rain.rng.integers(rain.rows))  # Each stack taps the ring somewhere else
+        x *= self.scale
+        y *= self.scale
+
+        # Department name is shown once per stack and never changes, followed by the falling Matrix rows
+        dept_line = self.dept_lines[word]
+        self.paper_atlas.blit_row(self.screen, dept_line, (x, y))
+        rect = rain.draw(self.screen, start - self.rain_scroll, stack_size - 1, (x, y), self.line_spacing, first_line=1)
+        self.rects.append(rect.union(pygame.Rect(x, y, self.paper_atlas.rects[dept_line].width, self.paper_atlas.height)))
+
+    def draw_hud(self, state):
+        # Display score, lives, and Pause indicator with Matrix green text on black background
+        self.hud.update(state.score, state.lives)
+        self.rects.extend(self.hud.draw(self.screen))
+
+    def begin_frame(self, view, background):
+        # Start a frame: either wipe last frame's regions or redraw the whole background
+        # (background None: plain black)
+        screen = self.screen
+        if self.dirty_rects and view == self.view and not self.full_frame:
+            for rect in self.prev_rects:
+                if background is None:
+                    screen.fill(BLACK, rect)
+                else:
+                    screen.blit(background, rect, rect)
+        else:
+            if background is None:
+                screen.fill(BLACK)
+            else:
+                screen.blit(background, (0, 0))
+            self.full_frame = True
+        self.view = view
+        self.rects = []
+
+    def begin_static_frame(self, view):
+        # Splash, pause and game over are full-screen; the next game frame must redraw everything
+        self.view = view
+        self.full_frame = True
+        self.rects = []
+
+    def present(self):
+        dirty = None  # Whole frame
+        if self.dirty_rects and not self.full_frame:
+            dirty = self.prev_rects + self.rects
+            dirty_area = sum(rect.width * rect.height for rect in dirty)
+            if dirty_area > self.full_frame_threshold * self.width * self.height:
+                dirty = None  # So much moved that one flip is cheaper than many small updates
+        if self.display is not None:
+            self.display.present(dirty)  # A scaled backbuffer always goes out whole
+        elif dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        self.prev_rects = self.rects
+        self.full_frame = False
+
+    def draw_game(self, state, alpha=1.0):
+        # alpha: how far real time has got from the previous tick (0) to the current one (1)
+        profile = self.profiler.scope
+        with profile("draw_background"):
+            background = self.backgrounds.dimmed(DIM_GAME) if self.background_compositing else None
+            self.begin_frame("game", background)  # Draw dimmed background at 50%
+        behind = 1.0 - alpha  # Fraction of a tick to wind motion back
+
+        papers = state.papers
+        paper_ids = papers.paper_id.tolist()
+
+        # Forget the rain of papers that were shot or fell off the screen
+        if len(self.paper_visuals) > len(paper_ids):
+            live_ids = set(paper_ids)
+            for paper_id in [i for i in self.paper_visuals if i not in live_ids]:
+                del self.paper_visuals[paper_id]
+
+        with profile("draw_player"):
+            # Draw player (simple vertical line or rectangle) with "SPACE DOGE" next to it
+            self.draw_player(state.player_x - (state.player_x - state.prev_player_x) * behind)
+        with profile("draw_bullets"):
+            bullets = state.bullets
+            for bullet in zip(bullets.x.tolist(), (bullets.y + BULLET_SPEED * behind).tolist()):
+                self.draw_bullet(bullet)
+        with profile("draw_paper"):
+            # Once per frame, not per stack: the rain falls a row every 5 frames (slower under load)
+            self.frame += 1
+            if self.frame % self.matrix_refresh == 0:
+                self.rain_scroll += 1
+                self.matrix_rain.advance()
+            paper_y = papers.y - PAPER_SPEED * behind
+            for paper in zip(papers.x.tolist(), paper_y.tolist(), papers.stack_size.tolist(), papers.word.tolist(), paper_ids):
+                self.draw_paper(*paper)
+        with profile("draw_explosion"):
+            # Create a circular pattern of "=" characters around each explosion
+            self.rects.extend(self.explosion_particles.draw(self.screen, state.explosions, EXPLOSION_FRAMES, PAPER_WIDTH // 2,
+                                                            self.explosion_stride, self.scale))
+
+        with profile("hud"):
+            self.draw_hud(state)
+
+    def draw_overlay(self, overlay):
+        # Profiler overlay goes on top of whatever screen is showing
+        self.rects.append(overlay.draw(self.screen, self.profiler))
+
+    def draw_paused(self):
+        # Paused state: dim the screen and show "Paused" in Matrix green
+        self.begin_static_frame("paused")
+        self.screen.blit(self.backgrounds.dimmed(DIM_PAUSE), (0, 0))
+        paused_text = self.text_cache.render(self.big_font, "Paused", MATRIX_GREEN)
+        self.screen.blit(paused_text, (self.width // 2 - paused_text.get_width() // 2, self.height // 2))
+
+    def draw_game_over(self, state):
+        screen = self.screen
+        self.begin_static_frame("game_over")
+        screen.blit(self.backgrounds.dimmed(DIM_GAME_OVER), (0, 0))  # Show dimmed background during game over
+        self.game_over_label.set(state.score)
+        game_over_surface = self.game_over_label.render()
+        restart_surface = self.restart_label.render()
+
+        # Add extra line break by increasing y offset
+        screen.blit(game_over_surface, (self.width // 2 - game_over_surface.get_width() // 2, self.height // 2 - self.px(30)))
+        screen.blit(restart_surface, (self.width // 2 - restart_surface.get_width() // 2, self.height // 2 + self.px(30)))
+
+    def compose_start_screen(self, with_background=True):
+        # The splash screen never changes, so it is drawn once into its own surface
+        if with_background:
+            screen = self.backgrounds.dimmed(DIM_SPLASH).copy()  # Show dimmed background at 65% on splash screen
+        else:
+            screen = self.screen.copy()  # Background still loading: text on black for now
+            screen.fill(BLACK)
+        font = self.font
+        render = self.text_cache.render
+        doge_text = render(self.big_font, "DOGE", GOLD)
+        doge_rect = doge_text.get_rect(center=(self.width // 2, self.height // 2))
+        screen.blit(doge_text, doge_rect)
+
+        slash_text = render(font, "///////////////////////////////////////////////////", WHITE)
+        screen.blit(slash_text, (self.width // 2 - slash_text.get_width() // 2, self.height // 2 - self.px(60)))
+        screen.blit(slash_text, (self.width // 2 - slash_text.get_width() // 2, self.height // 2 + self.px(60)))
+
+        vert_line = render(font, "|                                                        |", WHITE)
+        screen.blit(vert_line, (self.width // 2 - vert_line.get_width() // 2, self.height // 2 - self.px(45)))
+        screen.blit(vert_line, (self.width // 2 - vert_line.get_width() // 2, self.height // 2 - self.px(15)))
+        screen.blit(vert_line, (self.width // 2 - vert_line.get_width() // 2, self.height // 2 + self.px(15)))
+        screen.blit(vert_line, (self.width // 2 - vert_line.get_width() // 2, self.height // 2 + self.px(45)))
+
+        # Add extra line break and make "Press SPACE to Shoot Waste" Matrix green
+        start_text = render(font, "Press SPACE to Shoot Waste", MATRIX_GREEN)
+        screen.blit(start_text, (self.width // 2 - start_text.get_width() // 2, self.height // 2 + self.px(105)))  # Extra line break (moved down)
+
+        # Add bottom row of $$$$$$$$ spanning the whole screen in Matrix green
+        dollars_text = render(font, "$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$$", MATRIX_GREEN)
+        screen.blit(dollars_text, (0, self.height - self.px(30)))  # Position at bottom of screen
+        return screen
+
+    def draw_start_screen(self, background_ready=True):
+        # background_ready False: the background is still loading, show the text on black until it is
+        self.begin_static_frame("start")
+        if self.start_screen is None or (background_ready and not self.start_screen_background):
+            self.start_screen_background = background_ready
+            self.start_screen = self.compose_start_screen(background_ready)
+        self.screen.blit(self.start_screen, (0, 0))
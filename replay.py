@@ -0,0 +1,178 @@
+import struct
+
+import numpy as np
+
+from profiler import NULL_PROFILER
+from simulation import GameState, Inputs, TICK_RATE, step
+
+# Deterministic replays.
+# All gameplay randomness comes from the GameState's seeded RNG, so a game is fully
+# described by its seed plus the per-tick inputs. Inputs are stored as a delta stream:
+# a record is only written on ticks where the held keys change or shots are fired.
+#
+# File layout (little endian):
+#   header  "PIRP", version u8, seed u64, ticks u32, final score u32, record count u32
+#   records varint ticks since previous record, then one byte:
+#           bit 0 left held, bit 1 right held, bits 2-7 shots fired this tick
+#
+# Playback runs unthrottled and keeps a GameState snapshot every `snapshot_interval`
+# ticks, so seeking only re-simulates from the nearest earlier snapshot.
+
+MAGIC = b"PIRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBQIII")
+MAX_FIRE = 63  # Fits in the six spare bits of the record byte
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    def __init__(self, seed, keys, fire, final_score=0):
+        self.seed = seed
+        self.keys = keys  # uint8 per tick: bit 0 left, bit 1 right
+        self.fire = fire  # uint8 per tick: shots fired
+        self.final_score = final_score
+
+    @property
+    def ticks(self):
+        return len(self.keys)
+
+    def inputs(self, tick):
+        keys = int(self.keys[tick])
+        return Inputs(bool(keys & 1), bool(keys & 2), int(self.fire[tick]))
+
+    def encode(self):
+        # Only ticks where the held keys change (the stream starts with nothing held) or shots are fired
+        previous_keys = np.concatenate(([0], self.keys[:-1])).astype(np.uint8)
+        changes = np.flatnonzero((self.keys != previous_keys) | (self.fire > 0))
+        records = bytearray()
+        last_tick = 0
+        for tick in changes.tolist():
+            write_varint(records, tick - last_tick)
+            records.append(int(self.keys[tick]) | min(int(self.fire[tick]), MAX_FIRE) << 2)
+            last_tick = tick
+        return HEADER.pack(MAGIC, VERSION, self.seed, self.ticks, self.final_score, len(changes)) + bytes(records)
+
+    @classmethod
+    def decode(cls, data):
+        magic, version, seed, ticks, final_score, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a Paperwork Invaders replay (or an unsupported version)")
+        record_ticks = np.zeros(count, dtype=np.int64)
+        record_bytes = np.zeros(count, dtype=np.uint8)
+        pos = HEADER.size
+        tick = 0
+        for i in range(count):
+            delta, pos = read_varint(data, pos)
+            tick += delta
+            record_ticks[i] = tick
+            record_bytes[i] = data[pos]
+            pos += 1
+        # Held keys persist from each record until the next one; shots only on the record's tick
+        latest = np.searchsorted(record_ticks, np.arange(ticks), side="right") - 1
+        held = np.concatenate(([0], record_bytes & 3)).astype(np.uint8)  # Nothing held before the first record
+        keys = held[latest + 1]
+        fire = np.zeros(ticks, dtype=np.uint8)
+        fire[record_ticks] = record_bytes >> 2
+        return cls(seed, keys, fire, final_score)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.encode())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.decode(f.read())
+
+
+class ReplayRecorder:
+    # Call record() with the Inputs of every step() of one game, then save()
+    def __init__(self, seed):
+        self.seed = seed
+        self.keys = bytearray()
+        self.fire = bytearray()
+
+    def record(self, inputs):
+        self.keys.append(bool(inputs.left) | bool(inputs.right) << 1)
+        self.fire.append(min(inputs.fire, MAX_FIRE))
+
+    def replay(self, final_score=0):
+        return Replay(self.seed, np.frombuffer(bytes(self.keys), dtype=np.uint8),
+                      np.frombuffer(bytes(self.fire), dtype=np.uint8), final_score)
+
+    def save(self, path, final_score=0):
+        self.replay(final_score).save(path)
+
+
+class ReplayPlayer:
+    def __init__(self, replay, snapshot_interval=10 * TICK_RATE):
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        self.state = GameState(replay.seed)
+        self.snapshots = {0: self.state.copy()}  # tick -> GameState before that tick
+
+    @property
+    def tick(self):
+        return self.state.tick
+
+    @property
+    def finished(self):
+        return self.state.tick >= self.replay.ticks or self.state.game_over
+
+    def step(self, profiler=NULL_PROFILER):
+        tick = self.state.tick
+        if tick >= self.replay.ticks:
+            return self.state  # End of the recorded inputs: nothing left to play
+        if tick % self.snapshot_interval == 0 and tick not in self.snapshots:
+            self.snapshots[tick] = self.state.copy()
+        step(self.state, self.replay.inputs(tick), profiler)
+        return self.state
+
+    def run(self, until=None):
+        # Fast-forward without any frame pacing
+        until = self.replay.ticks if until is None else min(until, self.replay.ticks)
+        while self.state.tick < until and not self.state.game_over:
+            self.step()
+        return self.state
+
+    def seek(self, tick):
+        tick = max(0, min(tick, self.replay.ticks))
+        base = max(t for t in self.snapshots if t <= tick)
+        if not (base <= self.state.tick <= tick):
+            self.state = self.snapshots[base].copy()
+        return self.run(tick)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        sys.exit("usage: python replay.py REPLAY_FILE")
+    replay = Replay.load(sys.argv[1])
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    final = player.run()
+    elapsed = time.perf_counter() - start
+    print(f"{final.tick} ticks in {elapsed:.3f}s ({final.tick / max(elapsed, 1e-9):.0f} ticks/s, "
+          f"{final.tick / TICK_RATE / max(elapsed, 1e-9):.0f}x real time)")
+    print(f"score {final.score} (recorded {replay.final_score}), lives {final.lives}")
+    if final.score != replay.final_score:
+        sys.exit("replay diverged from the recorded game")
@@ -0,0 +1,227 @@
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from collision import find_hits
+from entities import EntityStore
+from profiler import NULL_PROFILER
+
+# Headless simulation core for Paperwork Invaders.
+# Nothing in here touches pygame: a GameState is advanced one fixed tick at a time by
+# step(), so the game logic can run without a display, fonts or a mixer.
+# Sounds are reported back as event names in state.events for the front end to play.
+
+# Screen settings
+WIDTH = 800
+HEIGHT = 600
+
+# Fixed timestep: one step() is one frame of the original 60 FPS loop
+TICK_RATE = 60
+
+# Player settings (simple vertical line or small rectangle in Matrix green)
+PLAYER_WIDTH = 8  # Thin vertical line or small rectangle
+PLAYER_HEIGHT = 20
+PLAYER_Y = HEIGHT - 40
+PLAYER_SPEED = 5
+
+# Bullet settings
+BULLET_WIDTH = 5
+BULLET_HEIGHT = 10
+BULLET_SPEED = 7
+
+# Paperwork enemy settings
+PAPER_WIDTH = 60
+LINE_SPACING = 15  # Reduced spacing for thinner appearance
+PAPER_SPEED = 1.5
+COLUMNS = 5
+COLUMN_WIDTH = WIDTH // COLUMNS
+MIN_STACK_SIZE = 3
+MAX_STACK_SIZE = 25
+SPAWN_INTERVAL = 45  # Frames between new paper stacks
+
+# Explosion settings
+EXPLOSION_FRAMES = 15
+EXPLOSION_KILL = 0  # Paper shot down (Matrix green)
+EXPLOSION_PLAYER_HIT = 1  # Paper reached the bottom and cost a life (brown)
+
+# Lives
+START_LIVES = 3  # Start with 3 lives
+MAX_LIVES = 5  # Maximum lives to prevent stacking
+BONUS_LIFE_ODDS = 0.5  # Chance a bonus paper shot on a multiple of 100 gives a life
+
+# Government department abbreviations (updated to official abbreviations, limited to 3-4 characters, expanded to 50 based on X and web data)
+PAPER_WORDS = [
+    "CIA", "FBI", "IRS", "DOD", "DHS", "DOJ", "VA", "HHS", "DEA", "ATF",
+    "SEC", "FTC", "TSA", "ICE", "FEMA", "NOAA", "NASA", "EPA", "NSA", "DIA",
+    "DARPA", "DCSA", "USDA", "DOT", "DOE", "DOC", "HUD", "DOL", "DOS", "SSA",
+    "OPM", "SBA", "BOP", "NCA", "USAID", "TREAS", "DOS",
+    "DOC", "DOH", "USDA", "DOJ", "DHS", "DOED", "USDT"
+]  # Updated to official abbreviations (e.g., "DOH" for Department of Health, "DOT" for Department of Transportation, "ED" for Education, "DOED" for Department of Education)
+
+# Entity columns (struct-of-arrays, see entities.py)
+BULLET_FIELDS = [("x", np.float64), ("y", np.float64)]
+PAPER_FIELDS = [
+    ("x", np.float64), ("y", np.float64), ("column", np.int32), ("stack_size", np.int32),
+    ("word", np.int32),  # Index into PAPER_WORDS
+    ("bonus", np.bool_), ("paper_id", np.int64),
+]
+EXPLOSION_FIELDS = [
+    ("x", np.float64), ("y", np.float64), ("timer", np.int32), ("max_size", np.float64),
+    ("kind", np.int8),  # EXPLOSION_KILL or EXPLOSION_PLAYER_HIT
+]
+
+# Per-tick player input: fire is the number of shots requested this tick
+Inputs = namedtuple("Inputs", ["left", "right", "fire"])
+NO_INPUT = Inputs(False, False, 0)
+
+
+class GameState:
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)  # Always known, so any game can be recorded and replayed
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.player_x = WIDTH // 2 - PLAYER_WIDTH // 2
+        self.prev_player_x = self.player_x  # Before the last step(), for render interpolation
+        self.bullets = EntityStore(BULLET_FIELDS, capacity=256)
+        self.papers = EntityStore(PAPER_FIELDS)
+        self.explosions = EntityStore(EXPLOSION_FIELDS)
+        self.score = 0
+        self.lives = START_LIVES
+        self.spawn_timer = 0
+        self.next_paper_id = 0
+        self.game_over = False
+        self.events = []  # Sound events produced by the last step()
+
+    def copy(self):
+        # Independent snapshot, including the RNG position
+        other = GameState.__new__(GameState)
+        other.__dict__.update(self.__dict__)
+        other.rng = random.Random()
+        other.rng.setstate(self.rng.getstate())
+        other.bullets = self.bullets.copy()
+        other.papers = self.papers.copy()
+        other.explosions = self.explosions.copy()
+        other.events = list(self.events)
+        return other
+
+
+def spawn_paper(state):
+    rng = state.rng
+    column = rng.randint(0, COLUMNS - 1)
+    x = column * COLUMN_WIDTH + (COLUMN_WIDTH - PAPER_WIDTH) // 2
+    # Ensure stack size is between 3 and 25 lines
+    stack_size = rng.randint(MIN_STACK_SIZE, MAX_STACK_SIZE)
+    height = stack_size * LINE_SPACING
+    word = rng.randrange(len(PAPER_WORDS))
+    # paper_id is stable for the paper's lifetime (rows move on swap-remove), so renderers key per-stack visuals on it
+    state.papers.add(x=x, y=-height, column=column, stack_size=stack_size, word=word,
+                     bonus=rng.choice([True, False]), paper_id=state.next_paper_id)
+    state.next_paper_id += 1
+
+
+def fire_bullet(state):
+    # Spawn bullet from the center of the player (top of the player)
+    bullet_x = state.player_x + PLAYER_WIDTH // 2 - BULLET_WIDTH // 2
+    state.bullets.add(x=bullet_x, y=PLAYER_Y)
+    state.events.append("shoot")
+
+
+def check_extra_life(state, paper_bonus):
+    if state.score > 0 and state.score % 100 == 0 and paper_bonus and state.rng.random() < BONUS_LIFE_ODDS and state.lives < MAX_LIVES:
+        state.lives += 1
+        state.events.append("bonus")
+
+
+def step(state, inputs=NO_INPUT, profiler=NULL_PROFILER):
+    state.events = []
+    if state.game_over:
+        return state
+    state.tick += 1
+
+    for _ in range(inputs.fire):
+        fire_bullet(state)
+
+    state.prev_player_x = state.player_x
+    if inputs.left and state.player_x > 0:
+        state.player_x -= PLAYER_SPEED
+    if inputs.right and state.player_x < WIDTH - PLAYER_WIDTH:
+        state.player_x += PLAYER_SPEED
+
+    with profiler.scope("spawn"):
+        state.spawn_timer += 1
+        if state.spawn_timer >= SPAWN_INTERVAL:
+            spawn_paper(state)
+            state.spawn_timer = 0
+
+    with profiler.scope("movement"):
+        # Movement and culling: one vectorized operation per column
+        bullets = state.bullets
+        bullets.y -= BULLET_SPEED
+
+        papers = state.papers
+        papers.y += PAPER_SPEED
+
+        explosions = state.explosions
+        explosions.timer += 1
+        explosions.cull(explosions.timer >= EXPLOSION_FRAMES)
+
+    with profiler.scope("collision"):
+        # Lane broadphase + swept test over this tick's motion (see collision.py)
+        paper_height = papers.stack_size * LINE_SPACING
+        hits = find_hits((bullets.x, bullets.y), (BULLET_WIDTH, BULLET_HEIGHT), -BULLET_SPEED,
+                         (papers.x, papers.y, paper_height, papers.column), PAPER_WIDTH, PAPER_SPEED,
+                         COLUMN_WIDTH, COLUMNS)
+        if hits:
+            dead_bullets = np.zeros(len(bullets), dtype=bool)
+            dead_papers = np.zeros(len(papers), dtype=bool)
+            for b, p in hits:
+                dead_bullets[b] = True
+                dead_papers[p] = True
+                explosions.add(x=papers.x[p], y=papers.y[p] + int(paper_height[p]) // 2, timer=0, max_size=PAPER_WIDTH,
+                               kind=EXPLOSION_KILL)
+                state.events.append("hit")
+                state.score += 1
+                check_extra_life(state, bool(papers.bonus[p]))  # Check for extra life after a kill
+            bullets.cull(dead_bullets)
+            papers.cull(dead_papers)
+        # Bullets leaving the screen go only now, after their last sweep could still hit a stack
+        bullets.cull(bullets.y <= -BULLET_HEIGHT)
+
+        # Only one paper reaching the bottom costs a life per tick
+        fallen = np.flatnonzero(papers.y + papers.stack_size * LINE_SPACING > HEIGHT)
+        if len(fallen):
+            p = fallen[0]
+            explosions.add(x=papers.x[p], y=PLAYER_Y + PLAYER_HEIGHT // 2, timer=0, max_size=PAPER_WIDTH,
+                           kind=EXPLOSION_PLAYER_HIT)  # Brown explosion
+            papers.remove(p)
+            state.lives -= 1
+            state.events.append("die")  # Play die sound when losing a life
+            if state.lives <= 0:
+                state.game_over = True
+
+    return state
+
+
+def run_headless(ticks, seed=None, policy=None):
+    # Advance a fresh game for up to `ticks` steps; policy(state) -> Inputs drives the player
+    state = GameState(seed)
+    for _ in range(ticks):
+        if state.game_over:
+            break
+        step(state, policy(state) if policy else NO_INPUT)
+    return state
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    bot_rng = random.Random(1)
+    start = time.perf_counter()
+    final = run_headless(ticks, seed=0, policy=lambda s: Inputs(bot_rng.random() < 0.3, bot_rng.random() < 0.3, int(bot_rng.random() < 0.2)))
+    elapsed = time.perf_counter() - start
+    print(f"{final.tick} ticks in {elapsed:.3f}s ({final.tick / elapsed:.0f} ticks/s), score {final.score}, lives {final.lives}")
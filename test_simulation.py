@@ -0,0 +1,50 @@
+import numpy as np
+
+import simulation
+from batchsim import DEFAULT_PARAMS, Batch
+from simulation import COLUMN_WIDTH, PAPER_WIDTH, LINE_SPACING, GameState, Inputs, step
+
+# Regression checks for the simulation (python -m pytest, or run this file directly).
+
+
+def test_bullet_leaving_screen_still_hits():
+    # A fast bullet that leaves the screen this tick (40 -> -20) must still hit a stack
+    # whose bottom (y=30) it passes on the way out, before it is culled
+    bullet_speed = simulation.BULLET_SPEED
+    simulation.BULLET_SPEED = 60
+    try:
+        state = GameState(seed=0)
+        state.spawn_timer = -1000  # No spawns this tick
+        stack_size = 3
+        x = (COLUMN_WIDTH - PAPER_WIDTH) // 2
+        state.papers.add(x=x, y=30 - stack_size * LINE_SPACING - simulation.PAPER_SPEED, column=0,
+                         stack_size=stack_size, word=0, bonus=False, paper_id=0)
+        state.bullets.add(x=x + PAPER_WIDTH // 2, y=40)
+        step(state)
+    finally:
+        simulation.BULLET_SPEED = bullet_speed
+    assert state.score == 1
+    assert len(state.bullets) == 0
+    assert len(state.papers) == 0
+
+
+def test_batch_bullet_leaving_screen_still_hits():
+    # Same case through batchsim, so the two models keep matching
+    params = DEFAULT_PARAMS._replace(bullet_speed=60)
+    batch = Batch(1, params, seed=0)
+    batch.spawn_timer = -1000
+    rows = np.arange(1)
+    height = 3 * LINE_SPACING
+    x = (COLUMN_WIDTH - PAPER_WIDTH) // 2
+    batch.add(batch.papers, rows, x=x, y=30 - height - params.paper_speed, height=height, bonus=False)
+    batch.add(batch.bullets, rows, x=x + PAPER_WIDTH // 2, y=40)
+    batch.step(Inputs(np.zeros(1, dtype=bool), np.zeros(1, dtype=bool), np.zeros(1, dtype=np.int64)))
+    assert batch.score.tolist() == [1]
+    assert not batch.bullets["alive"].any()
+    assert not batch.papers["alive"].any()
+
+
+if __name__ == "__main__":
+    test_bullet_leaving_screen_still_hits()
+    test_batch_bullet_leaving_screen_still_hits()
+    print("ok")